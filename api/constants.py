@@ -49,3 +49,23 @@ SENTRY_DSN = os.getenv("SENTRY_DSN")
 ENABLE_ARI_STASIS = os.getenv("ENABLE_ARI_STASIS", "false").lower() == "true"
 SERIALIZE_LOG_OUTPUT = os.getenv("SERIALIZE_LOG_OUTPUT", "false").lower() == "true"
 ENABLE_TELEMETRY = os.getenv("ENABLE_TELEMETRY", "false").lower() == "true"
+
+# Persist non-terminal Twilio status callbacks (initiated, ringing, in-progress)
+# in workflow run logs. Off by default, only terminal statuses are acted upon.
+TELEPHONY_LOG_PROGRESS = os.getenv("TELEPHONY_LOG_PROGRESS", "false").lower() == "true"
+
+# Reject Twilio status callbacks without an X-Twilio-Signature header. Only
+# disable for local testing with hand-crafted callbacks.
+TELEPHONY_REQUIRE_SIGNATURE = (
+    os.getenv("TELEPHONY_REQUIRE_SIGNATURE", "true").lower() == "true"
+)
+
+# Outbound buffering for Twilio media stream WebSockets. Above the enter
+# threshold the oldest buffered audio is dropped, until the buffer drains below
+# the exit threshold.
+TWILIO_WS_BACKPRESSURE_ENTER_BYTES = int(
+    os.getenv("TWILIO_WS_BACKPRESSURE_ENTER_BYTES", str(512 * 1024))
+)
+TWILIO_WS_BACKPRESSURE_EXIT_BYTES = int(
+    os.getenv("TWILIO_WS_BACKPRESSURE_EXIT_BYTES", "1024")
+)
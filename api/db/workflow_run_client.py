@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import JSON, cast, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload, selectinload
 
@@ -214,6 +215,26 @@ class WorkflowRunClient(BaseDBClient):
             )
             return result.scalars().first()
 
+    async def get_workflow_run_with_org(
+        self, run_id: int
+    ) -> Tuple[Optional[WorkflowRunModel], Optional[int]]:
+        """
+        Get workflow run and the organization_id of its workflow in one query.
+
+        Returns:
+            Tuple of (workflow_run, organization_id) or (None, None) if not found
+        """
+        async with self.async_session() as session:
+            result = await session.execute(
+                select(WorkflowRunModel, WorkflowModel.organization_id)
+                .join(WorkflowModel, WorkflowRunModel.workflow_id == WorkflowModel.id)
+                .where(WorkflowRunModel.id == run_id)
+            )
+            row = result.first()
+            if not row:
+                return None, None
+            return row[0], row[1]
+
     async def get_workflow_runs_by_workflow_id(
         self,
         workflow_id: int,
@@ -345,6 +366,51 @@ class WorkflowRunClient(BaseDBClient):
             await session.refresh(run)
         return run
 
+    async def append_workflow_run_log(
+        self,
+        run_id: int,
+        key: str,
+        entry: dict,
+        is_completed: bool = False,
+        gathered_context: dict | None = None,
+    ) -> None:
+        """Append ``entry`` to the ``logs[key]`` list in a single UPDATE.
+
+        Unlike ``update_workflow_run`` the existing logs are never read back,
+        so concurrent appends (e.g. back to back status callbacks) cannot
+        overwrite each other. ``gathered_context`` keys are merged the same
+        way ``update_workflow_run`` merges them.
+        """
+        # The columns are JSON, so cast to jsonb for the operators and back.
+        # "->" is spelled out, subscripting would need PostgreSQL 14+.
+        logs = func.coalesce(cast(WorkflowRunModel.logs, JSONB), cast({}, JSONB))
+        entries = func.coalesce(
+            logs.op("->", return_type=JSONB)(key), cast([], JSONB)
+        ).op("||")(cast([entry], JSONB))
+        values: Dict[str, Any] = {
+            "logs": cast(logs.op("||")(func.jsonb_build_object(key, entries)), JSON)
+        }
+        if gathered_context:
+            values["gathered_context"] = cast(
+                cast(WorkflowRunModel.gathered_context, JSONB).op("||")(
+                    cast(gathered_context, JSONB)
+                ),
+                JSON,
+            )
+        if is_completed:
+            values["is_completed"] = is_completed
+
+        async with self.async_session() as session:
+            result = await session.execute(
+                WorkflowRunModel.__table__.update()
+                .where(WorkflowRunModel.id == run_id)
+                .values(**values)
+            )
+            if result.rowcount == 0:
+                await session.rollback()
+                raise ValueError(f"Workflow run with ID {run_id} not found")
+            await session.commit()
+
     async def update_admin_comment(
         self, run_id: int, admin_comment: str
     ) -> WorkflowRunModel:
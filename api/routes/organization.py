@@ -10,6 +10,7 @@ from api.schemas.telephony_config import (
 )
 from api.services.auth.depends import get_user
 from api.services.configuration.masking import is_mask_of, mask_key
+from api.services.telephony.twilio import invalidate_twilio_service
 
 router = APIRouter(prefix="/organizations", tags=["organizations"])
 
@@ -81,5 +82,6 @@ async def save_telephony_configuration(
         OrganizationConfigurationKey.TWILIO_CONFIGURATION.value,
         config_value,
     )
+    invalidate_twilio_service(user.selected_organization_id)
 
     return {"message": "Telephony configuration saved successfully"}
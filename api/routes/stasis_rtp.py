@@ -1,4 +1,4 @@
-import random
+import secrets
 
 from loguru import logger
 from pipecat.utils.context import set_current_run_id
@@ -25,7 +25,7 @@ async def on_stasis_call(call: StasisRTPConnection, call_context_vars: dict):
         logger.error(f"Invalid workflow ID or user ID: {workflow_id} or {user_id}")
         return
 
-    workflow_run_name = f"WR-ARI-{random.randint(1000, 9999)}"
+    workflow_run_name = f"WR-ARI-{secrets.token_hex(3)}"
     workflow_run = await db_client.create_workflow_run(
         workflow_run_name, workflow_id, WorkflowRunMode.STASIS.value, user_id
     )
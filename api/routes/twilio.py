@@ -1,15 +1,23 @@
-import json
-import random
-from datetime import UTC, datetime
-from typing import Annotated, Optional
-
-from fastapi import APIRouter, Depends, Form, Header, HTTPException, Request, WebSocket
+import asyncio
+import secrets
+import time
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, WebSocket
 from loguru import logger
 from pydantic import BaseModel
-from starlette.responses import HTMLResponse
+from starlette.responses import Response
 
+from api.constants import (
+    TELEPHONY_LOG_PROGRESS,
+    TELEPHONY_REQUIRE_SIGNATURE,
+    TWILIO_WS_BACKPRESSURE_ENTER_BYTES,
+    TWILIO_WS_BACKPRESSURE_EXIT_BYTES,
+)
 from api.db import db_client
-from api.db.models import UserModel
+from api.db.models import UserModel, WorkflowRunModel
 from api.enums import OrganizationConfigurationKey, WorkflowRunMode
 from api.services.auth.depends import get_user
 from api.services.campaign.call_dispatcher import campaign_call_dispatcher
@@ -17,28 +25,106 @@ from api.services.campaign.campaign_event_publisher import (
     get_campaign_event_publisher,
 )
 from api.services.pipecat.run_pipeline import run_pipeline_twilio
-from api.services.telephony.twilio import TwilioService
+from api.services.telephony.twilio import (
+    STATUS_CALLBACK_EXTRA_FIELDS,
+    STATUS_CALLBACK_MAX_FIELDS,
+    extract_start_sids,
+    get_twilio_service,
+    invalidate_twilio_service,
+    parse_status_callback_fields,
+)
+from api.services.telephony.websocket_backpressure import BackpressureWebSocket
+from api.utils import fast_json
+from api.utils.tunnel import TunnelURLProvider
 from pipecat.utils.context import set_current_run_id
 
 router = APIRouter(prefix="/twilio")
 
+# Call statuses that only report progress of a call that has not ended yet
+PROGRESS_ONLY_STATUSES = frozenset({"queued", "initiated", "ringing", "in-progress"})
+
 
 class InitiateCallRequest(BaseModel):
     workflow_id: int
     workflow_run_id: int | None = None
 
 
-class TwilioStatusCallbackRequest(BaseModel):
-    CallSid: str
-    CallStatus: str
-    From: Optional[str] = None
-    To: Optional[str] = None
-    Direction: Optional[str] = None
-    Duration: Optional[str] = None
-    CallDuration: Optional[str] = None
-    RecordingUrl: Optional[str] = None
-    RecordingSid: Optional[str] = None
-    Timestamp: Optional[str] = None
+@dataclass(slots=True)
+class StatusCallbackRequest:
+    """Call status update, normalized from a telephony provider callback.
+
+    Internal only (never part of a request or response schema), so it is a
+    plain dataclass rather than a validated pydantic model.
+    """
+
+    call_id: str
+    status: str
+    from_number: Optional[str] = None
+    to_number: Optional[str] = None
+    direction: Optional[str] = None
+    duration: Optional[str] = None
+    extra: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_provider(
+        cls, provider: str, data: Mapping[str, str]
+    ) -> "StatusCallbackRequest":
+        """Build from a provider's status callback fields.
+
+        Raises:
+            ValueError: If no parser is registered for the provider
+        """
+        parser = STATUS_CALLBACK_PARSERS.get(provider)
+        if parser is None:
+            raise ValueError(f"Unsupported telephony provider: {provider}")
+        return parser(data)
+
+    @classmethod
+    def from_twilio(cls, data: Mapping[str, str]) -> "StatusCallbackRequest":
+        """Build from Twilio status callback fields, keeping only allowed extras."""
+        return _parse_twilio_status(data)
+
+    def to_log_data(self) -> Dict[str, Any]:
+        """Compact representation stored with each callback log entry."""
+        data = {
+            name: value
+            for name, value in (
+                ("call_id", self.call_id),
+                ("from_number", self.from_number),
+                ("to_number", self.to_number),
+                ("direction", self.direction),
+                ("duration", self.duration),
+            )
+            if value is not None
+        }
+        if self.extra:
+            data["extras"] = self.extra
+        return data
+
+
+def _parse_twilio_status(data: Mapping[str, str]) -> StatusCallbackRequest:
+    get = data.get
+    return StatusCallbackRequest(
+        call_id=data["CallSid"],
+        status=data["CallStatus"],
+        from_number=get("From"),
+        to_number=get("To"),
+        direction=get("Direction"),
+        duration=get("CallDuration") or get("Duration"),
+        extra={
+            key: value
+            for key, value in data.items()
+            if key in STATUS_CALLBACK_EXTRA_FIELDS
+        },
+    )
+
+
+# Status callback parser per telephony provider, keyed by provider type
+STATUS_CALLBACK_PARSERS: Dict[
+    str, Callable[[Mapping[str, str]], StatusCallbackRequest]
+] = {
+    WorkflowRunMode.TWILIO.value: _parse_twilio_status,
+}
 
 
 @router.post("/initiate-call")
@@ -62,7 +148,7 @@ async def initiate_call(
     workflow_run_id = request.workflow_run_id
 
     if not workflow_run_id:
-        workflow_run_name = f"WR-TEL-{random.randint(1000, 9999)}"
+        workflow_run_name = f"WR-TEL-{secrets.token_hex(3)}"
         workflow_run = await db_client.create_workflow_run(
             workflow_run_name,
             request.workflow_id,
@@ -80,7 +166,7 @@ async def initiate_call(
         workflow_run_name = workflow_run.name
 
     if user_configuration.test_phone_number:
-        twilio_service = TwilioService(user.selected_organization_id)
+        twilio_service = get_twilio_service(user.selected_organization_id)
         await twilio_service.initiate_call(
             to_number=user_configuration.test_phone_number,
             url_args={
@@ -102,21 +188,28 @@ async def initiate_call(
 async def start_call(
     workflow_id: int, user_id: int, workflow_run_id: int, organization_id: int
 ):
-    twiml_content = await TwilioService(organization_id).get_start_call_twiml(
-        workflow_id, user_id, workflow_run_id
-    )
-    return HTMLResponse(content=twiml_content, media_type="application/xml")
+    twiml_content = await get_twilio_service(
+        organization_id
+    ).get_start_call_twiml_bytes(workflow_id, user_id, workflow_run_id)
+    # Already encoded, so the response sends it as is
+    return Response(content=twiml_content, media_type="application/xml")
 
 
 @router.websocket("/ws/{workflow_id}/{user_id}/{workflow_run_id}")
 async def websocket_endpoint(
     websocket: WebSocket, workflow_id: int, user_id: int, workflow_run_id: int
 ):
+    """Twilio media stream for a call.
+
+    Twilio sends small JSON frames (about 250 bytes of base64 µ-law audio every
+    20 ms), which is what the uvicorn WebSocket limits in
+    scripts/start_services.sh are sized for.
+    """
     await websocket.accept()
 
     try:
         # "connected" (ignore)
-        msg = json.loads(await websocket.receive_text())
+        msg = fast_json.loads(await websocket.receive_text())
         if msg.get("event") != "connected":
             raise RuntimeError("Expected connected message first")
 
@@ -126,26 +219,47 @@ async def websocket_endpoint(
         # set the run context
         set_current_run_id(workflow_run_id)
 
-        logger.debug(f"Received start message: {start_msg}")
+        logger.opt(lazy=True).debug("Received start message: {}", lambda: start_msg)
 
-        start_msg = json.loads(start_msg)
-        if start_msg.get("event") != "start":
-            raise RuntimeError("Expected start message second")
+        sids = extract_start_sids(start_msg)
+        if sids is None:
+            # Not in Twilio's compact layout, fall back to a full parse
+            start_event = fast_json.loads(start_msg)
+            if start_event.get("event") != "start":
+                raise RuntimeError("Expected start message second")
 
-        try:
-            stream_sid = start_msg["start"]["streamSid"]
-            call_sid = start_msg["start"]["callSid"]
-        except KeyError:
-            logger.error(
-                "Missing callSID and streamSID in start message. Closing connection."
-            )
-            await websocket.close(code=4400, reason="Missing or bad start message")
-            return
+            try:
+                sids = (
+                    start_event["start"]["streamSid"],
+                    start_event["start"]["callSid"],
+                )
+            except KeyError:
+                logger.error(
+                    "Missing callSID and streamSID in start message. Closing connection."
+                )
+                await websocket.close(code=4400, reason="Missing or bad start message")
+                return
 
-        # Run your Pipecat bot
-        await run_pipeline_twilio(
-            websocket, stream_sid, call_sid, workflow_id, workflow_run_id, user_id
+        stream_sid, call_sid = sids
+
+        # Run your Pipecat bot, buffering its output so a lagging Twilio edge
+        # sheds stale audio instead of growing the send buffer without bound
+        media_websocket = BackpressureWebSocket(
+            websocket,
+            enter_bytes=TWILIO_WS_BACKPRESSURE_ENTER_BYTES,
+            exit_bytes=TWILIO_WS_BACKPRESSURE_EXIT_BYTES,
         )
+        try:
+            await run_pipeline_twilio(
+                media_websocket,
+                stream_sid,
+                call_sid,
+                workflow_id,
+                workflow_run_id,
+                user_id,
+            )
+        finally:
+            await media_websocket.stop()
     except Exception as e:
         logger.error(f"Error in Twilio WebSocket connection: {e}")
         await websocket.close(1011, "Internal server error")
@@ -158,100 +272,166 @@ async def status_callback(
     x_twilio_signature: Annotated[
         Optional[str], Header(alias="X-Twilio-Signature")
     ] = None,
-    CallSid: str = Form(...),
-    CallStatus: str = Form(...),
-    From: Optional[str] = Form(None),
-    To: Optional[str] = Form(None),
-    Direction: Optional[str] = Form(None),
-    Duration: Optional[str] = Form(None),
-    CallDuration: Optional[str] = Form(None),
-    RecordingUrl: Optional[str] = Form(None),
-    RecordingSid: Optional[str] = Form(None),
-    Timestamp: Optional[str] = Form(None),
 ):
     """Handle Twilio status callbacks for call lifecycle events."""
-    try:
-        # TODO: Implement Twilio signature verification
-
-        # Create callback data object
-        callback_data = {
-            "CallSid": CallSid,
-            "CallStatus": CallStatus,
-            "From": From,
-            "To": To,
-            "Direction": Direction,
-            "Duration": Duration,
-            "CallDuration": CallDuration,
-            "RecordingUrl": RecordingUrl,
-            "RecordingSid": RecordingSid,
-            "Timestamp": Timestamp,
-        }
+    # Twilio signs every callback, reject unsigned ones before doing any work
+    if not x_twilio_signature and TELEPHONY_REQUIRE_SIGNATURE:
+        logger.warning(
+            f"Rejecting unsigned Twilio status callback for workflow_run_id {workflow_run_id}"
+        )
+        raise HTTPException(status_code=401, detail="Missing Twilio signature")
+
+    # Keep the raw body around, signature verification needs the exact payload
+    raw_body = await request.body()
+    callback_data = parse_status_callback_fields(raw_body)
+
+    if not callback_data.get("CallSid") or not callback_data.get("CallStatus"):
+        raise HTTPException(status_code=422, detail="Missing CallSid or CallStatus")
 
-        # Remove None values for cleaner logging
-        callback_data = {k: v for k, v in callback_data.items() if v is not None}
+    status_update = StatusCallbackRequest.from_provider(
+        WorkflowRunMode.TWILIO.value, callback_data
+    )
+
+    # Progress-only statuses need no reaction, skip the database entirely
+    # unless they are configured to be logged
+    if (
+        status_update.status.lower() in PROGRESS_ONLY_STATUSES
+        and not TELEPHONY_LOG_PROGRESS
+    ):
+        return {"status": "success", "message": "Callback skipped"}
 
+    try:
         logger.info(
-            f"Received Twilio status callback for workflow_run_id {workflow_run_id}: {CallStatus}"
+            f"Received Twilio status callback for workflow_run_id {workflow_run_id}: {status_update.status}"
         )
 
-        # Get the current workflow run
-        workflow_run = await db_client.get_workflow_run_by_id(workflow_run_id)
+        # Get the current workflow run along with its organization, which is
+        # what signature verification needs, in a single query
+        workflow_run, organization_id = await db_client.get_workflow_run_with_org(
+            workflow_run_id
+        )
         if not workflow_run:
             logger.error(f"Workflow run {workflow_run_id} not found for callback")
             return {"status": "error", "message": "Workflow run not found"}
 
-        callback_logs = workflow_run.logs.get("twilio_status_callbacks", [])
-
-        # Add new callback log entry to logs
-        callback_log = {
-            "status": CallStatus,
-            "timestamp": datetime.now(UTC).isoformat(),
-            "data": callback_data,
-        }
-        callback_logs.append(callback_log)
-
-        # Update the workflow run with the new logs
-        await db_client.update_workflow_run(
-            run_id=workflow_run_id, logs={"twilio_status_callbacks": callback_logs}
-        )
-
-        # Release concurrent slot when call ends (for any terminal status)
-        terminal_statuses = ["completed", "busy", "no-answer", "failed", "canceled"]
-        if CallStatus.lower() in terminal_statuses and workflow_run.campaign_id:
-            # Release the concurrent slot for this call
-            await campaign_call_dispatcher.release_call_slot(workflow_run_id)
-
-        # Check if retry is needed for campaign calls
-        if (
-            CallStatus.lower() in ["busy", "no-answer", "failed"]
-            and workflow_run.campaign_id
-        ):
-            # Lets retry for busy and no-answer
-            if CallStatus.lower() in ["busy", "no-answer"]:
-                publisher = await get_campaign_event_publisher()
-                await publisher.publish_retry_needed(
-                    workflow_run_id=workflow_run_id,
-                    reason=CallStatus.lower().replace(
-                        "-", "_"
-                    ),  # Convert no-answer to no_answer
-                    campaign_id=workflow_run.campaign_id,
-                    queued_run_id=workflow_run.queued_run_id,
+        if x_twilio_signature and organization_id:
+            # Twilio signs the callback URL we registered plus every POST field
+            backend_endpoint = await TunnelURLProvider.get_tunnel_url()
+            callback_url = f"https://{backend_endpoint}/api/v1/twilio/status-callback/{workflow_run_id}"
+            try:
+                params = dict(
+                    parse_qsl(
+                        raw_body.decode(errors="replace"),
+                        keep_blank_values=True,
+                        max_num_fields=STATUS_CALLBACK_MAX_FIELDS,
+                    )
                 )
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Malformed callback body")
 
-            # Update workflow run with appropriate tags
-            call_tags = workflow_run.gathered_context.get("call_tags", [])
-            call_tags.extend(["not_connected", f"twilio_{CallStatus.lower()}"])
-
-            await db_client.update_workflow_run(
-                run_id=workflow_run_id,
-                is_completed=True,
-                gathered_context={
-                    "call_tags": call_tags,
-                },
+            is_valid = await get_twilio_service(organization_id).verify_signature(
+                callback_url, params, x_twilio_signature
             )
+            if not is_valid:
+                # The cached auth token may predate a rotation saved on another
+                # worker, and Twilio does not retry rejected callbacks
+                invalidate_twilio_service(organization_id)
+                is_valid = await get_twilio_service(organization_id).verify_signature(
+                    callback_url, params, x_twilio_signature
+                )
+            if not is_valid:
+                logger.warning(
+                    f"Invalid Twilio signature for workflow_run_id {workflow_run_id}"
+                )
+                raise HTTPException(status_code=403, detail="Invalid signature")
+        elif TELEPHONY_REQUIRE_SIGNATURE:
+            logger.warning(
+                f"Cannot verify Twilio signature, no organization for workflow_run_id {workflow_run_id}"
+            )
+            raise HTTPException(status_code=403, detail="Invalid signature")
+
+        await _process_status_update(workflow_run, status_update)
 
         return {"status": "success", "message": "Callback processed"}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing Twilio status callback: {e}")
         return {"status": "error", "message": str(e)}
+
+
+# (whole second, formatted "YYYY-MM-DDTHH:MM:SS") for the last timestamp
+_iso_second: Tuple[int, str] = (0, "")
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time in ISO 8601, formatting the date part once per second."""
+    global _iso_second
+
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _iso_second
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _iso_second = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}+00:00"
+
+
+async def _process_status_update(
+    workflow_run: WorkflowRunModel, status_update: StatusCallbackRequest
+) -> None:
+    """Record a status callback on the workflow run and react to terminal statuses."""
+    workflow_run_id = workflow_run.id
+    call_status = status_update.status.lower()
+
+    # Add new callback log entry to logs. Entries written before the
+    # compact format carry the raw Twilio fields under "data" instead.
+    callback_log = {
+        "status": status_update.status,
+        "timestamp": _utc_now_iso(),
+        "data": status_update.to_log_data(),
+    }
+
+    # Written alongside the log entry when the call did not connect
+    updates: Dict[str, Any] = {}
+
+    is_campaign_call = bool(workflow_run.campaign_id)
+    if call_status in ["busy", "no-answer", "failed"] and is_campaign_call:
+        # Update workflow run with appropriate tags
+        call_tags = workflow_run.gathered_context.get("call_tags", [])
+        call_tags.extend(["not_connected", f"twilio_{call_status}"])
+
+        updates["is_completed"] = True
+        updates["gathered_context"] = {"call_tags": call_tags}
+
+    # The workflow run update, slot release and retry event are independent,
+    # so issue them concurrently instead of paying for each round-trip in turn.
+    # The entry is appended by the database, so callbacks racing for the same
+    # run cannot overwrite each other's entries.
+    pending = [
+        db_client.append_workflow_run_log(
+            workflow_run_id, "twilio_status_callbacks", callback_log, **updates
+        )
+    ]
+
+    # Release concurrent slot when call ends (for any terminal status)
+    terminal_statuses = ["completed", "busy", "no-answer", "failed", "canceled"]
+    if call_status in terminal_statuses and is_campaign_call:
+        pending.append(campaign_call_dispatcher.release_call_slot(workflow_run_id))
+
+    # Lets retry for busy and no-answer campaign calls
+    if call_status in ["busy", "no-answer"] and is_campaign_call:
+        pending.append(_publish_retry_needed(workflow_run, call_status))
+
+    await asyncio.gather(*pending)
+
+
+async def _publish_retry_needed(workflow_run: WorkflowRunModel, call_status: str):
+    publisher = await get_campaign_event_publisher()
+    await publisher.publish_retry_needed(
+        workflow_run_id=workflow_run.id,
+        reason=call_status.replace("-", "_"),  # Convert no-answer to no_answer
+        campaign_id=workflow_run.campaign_id,
+        queued_run_id=workflow_run.queued_run_id,
+    )
@@ -9,7 +9,7 @@ from api.db import db_client
 from api.db.models import QueuedRunModel, WorkflowRunModel
 from api.enums import OrganizationConfigurationKey, WorkflowRunMode
 from api.services.campaign.rate_limiter import rate_limiter
-from api.services.telephony.twilio import TwilioService
+from api.services.telephony.twilio import TwilioService, get_twilio_service
 
 
 class CampaignCallDispatcher:
@@ -20,7 +20,7 @@ class CampaignCallDispatcher:
 
     def get_twilio_service(self, organization_id: int) -> TwilioService:
         """Get TwilioService instance for specific organization"""
-        return TwilioService(organization_id)
+        return get_twilio_service(organization_id)
 
     async def get_org_concurrent_limit(self, organization_id: int) -> int:
         """Get the concurrent call limit for an organization."""
@@ -1,16 +1,30 @@
+import base64
+import hashlib
+import hmac
 import random
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlencode
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote_plus, unquote_plus, urlencode, urlparse
 
 import aiohttp
 from loguru import logger
 from pydantic import ValidationError
-from twilio.request_validator import RequestValidator
 
 from api.db import db_client
 from api.enums import OrganizationConfigurationKey
 from api.utils.tunnel import TunnelURLProvider
 
+# The start call TwiML only varies by the stream URL, so the rest is encoded once
+_START_CALL_TWIML_PREFIX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Connect>
+        <Stream url="wss://"""
+_START_CALL_TWIML_SUFFIX = b"""\"></Stream>
+    </Connect>
+    <Pause length="40"/>
+</Response>"""
+
 
 class TwilioService:
     """Service for interacting with Twilio API."""
@@ -87,13 +101,25 @@ class TwilioService:
         # Get tunnel URL at runtime
         backend_endpoint = await TunnelURLProvider.get_tunnel_url()
 
-        # Construct the URL with parameters if any
-        url: str = f"https://{backend_endpoint}/api/v1/twilio/twiml"
-        if url_args:
-            query_string = urlencode(url_args)
-            url = f"{url}?{query_string}"
+        # Construct the URL with parameters if any. Only the workflow run id
+        # changes between calls of a campaign, so the rest comes from a template
+        workflow_run_arg = url_args.get("workflow_run_id")
+        if workflow_run_arg is not None:
+            static_args = tuple(
+                (key, value)
+                for key, value in url_args.items()
+                if key != "workflow_run_id"
+            )
+            url = build_twiml_url_template(backend_endpoint, static_args).format(
+                workflow_run_id=quote_plus(str(workflow_run_arg))
+            )
+        else:
+            url = f"https://{backend_endpoint}/api/v1/twilio/twiml"
+            if url_args:
+                query_string = urlencode(url_args)
+                url = f"{url}?{query_string}"
 
-        logger.debug(f"Initiating call with URL: {url}")
+        logger.opt(lazy=True).debug("Initiating call with URL: {}", lambda: url)
 
         # Get phone numbers for organization and select one randomly
         phone_numbers = await self.get_organization_phone_numbers()
@@ -135,20 +161,28 @@ class TwilioService:
 
                 return await response.json()
 
-    async def get_start_call_twiml(
+    async def get_start_call_twiml_bytes(
         self, workflow_id: int, user_id: int, workflow_run_id: int
-    ) -> str:
+    ) -> bytes:
+        """TwiML connecting the call to our media stream, UTF-8 encoded."""
         # Get tunnel URL at runtime
         backend_endpoint = await TunnelURLProvider.get_tunnel_url()
 
-        twiml_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Connect>
-        <Stream url="wss://{backend_endpoint}/api/v1/twilio/ws/{workflow_id}/{user_id}/{workflow_run_id}"></Stream>
-    </Connect>
-    <Pause length="40"/>
-</Response>"""
-        return twiml_content
+        stream_url = (
+            f"{backend_endpoint}/api/v1/twilio/ws/"
+            f"{workflow_id}/{user_id}/{workflow_run_id}"
+        )
+        return b"".join(
+            (_START_CALL_TWIML_PREFIX, stream_url.encode(), _START_CALL_TWIML_SUFFIX)
+        )
+
+    async def get_start_call_twiml(
+        self, workflow_id: int, user_id: int, workflow_run_id: int
+    ) -> str:
+        twiml_content = await self.get_start_call_twiml_bytes(
+            workflow_id, user_id, workflow_run_id
+        )
+        return twiml_content.decode()
 
     async def get_call(self, call_sid: str) -> Dict[str, Any]:
         """
@@ -177,7 +211,10 @@ class TwilioService:
         self, url: str, params: Dict[str, Any], signature: str
     ) -> bool:
         """
-        Verify Twilio request signature using official Twilio SDK.
+        Verify Twilio request signature (HMAC-SHA1 over URL and sorted params).
+
+        Like the Twilio SDK validator, the URL is also checked with its default
+        port added, since Twilio may sign either form.
 
         Args:
             url: The full URL of the webhook
@@ -189,5 +226,193 @@ class TwilioService:
         """
         await self._ensure_credentials()
 
-        validator = RequestValidator(self.auth_token)
-        return validator.validate(url, params, signature)
+        key = self.auth_token.encode()
+        provided = signature.encode()
+        if hmac.compare_digest(compute_signature(key, url, params), provided):
+            return True
+
+        url_with_port = _with_default_port(url)
+        return url_with_port != url and hmac.compare_digest(
+            compute_signature(key, url_with_port, params), provided
+        )
+
+
+def compute_signature(auth_token: bytes, url: str, params: Dict[str, Any]) -> bytes:
+    """
+    Compute the base64 X-Twilio-Signature value for a webhook request.
+
+    The signed payload is built in a single bytearray rather than through
+    intermediate concatenated strings.
+    """
+    payload = bytearray(url.encode())
+    extend = payload.extend
+    for name in sorted(params):
+        extend(name.encode())
+        extend(str(params[name]).encode())
+    return base64.b64encode(hmac.new(auth_token, payload, hashlib.sha1).digest())
+
+
+def _with_default_port(url: str) -> str:
+    parsed = urlparse(url)
+    if parsed.port or not parsed.hostname:
+        return url
+    port = 443 if parsed.scheme == "https" else 80
+    return parsed._replace(netloc=f"{parsed.netloc}:{port}").geturl()
+
+
+# Optional status callback fields worth keeping with the call log. Anything
+# beyond these and the core fields is dropped rather than stored per callback.
+STATUS_CALLBACK_EXTRA_FIELDS = frozenset(
+    {
+        "SipResponseCode",
+        "AnsweredBy",
+        "MachineDetectionDuration",
+        "ErrorCode",
+        "RecordingUrl",
+        "RecordingSid",
+    }
+)
+
+# Status callback fields we record for a call. Twilio sends many more (account,
+# caller location, API version, ...) which are not decoded at all.
+STATUS_CALLBACK_FIELDS = (
+    frozenset(
+        {
+            "CallSid",
+            "CallStatus",
+            "From",
+            "To",
+            "Direction",
+            "Duration",
+            "CallDuration",
+        }
+    )
+    | STATUS_CALLBACK_EXTRA_FIELDS
+)
+
+# Twilio sends 15-30 fields per status callback, anything far beyond that is
+# not a genuine callback
+STATUS_CALLBACK_MAX_FIELDS = 64
+
+
+def parse_status_callback_fields(body: bytes) -> Dict[str, str]:
+    """
+    Extract the status callback fields we use from a form-urlencoded body.
+
+    Scans the body once and only decodes the values of STATUS_CALLBACK_FIELDS,
+    instead of building a full form mapping for every field Twilio sends.
+
+    Args:
+        body: The raw application/x-www-form-urlencoded request body
+
+    Returns:
+        Dict of the known fields present in the body
+    """
+    # Bound locally, the loop runs once per field Twilio sends
+    known_fields = STATUS_CALLBACK_FIELDS
+    unquote = unquote_plus
+
+    fields: Dict[str, str] = {}
+    for pair in body.split(b"&"):
+        key, _, value = pair.partition(b"=")
+        name = key.decode("ascii", "replace")
+        if name in known_fields:
+            fields[name] = unquote(value.decode("ascii", "replace"))
+    return fields
+
+
+def _find_json_string(message: str, key: str) -> Optional[str]:
+    """Value of the first "key":"value" pair in compact JSON, if unescaped."""
+    marker = f'"{key}":"'
+    start = message.find(marker)
+    if start == -1:
+        return None
+    start += len(marker)
+    end = message.find('"', start)
+    if end == -1:
+        return None
+    value = message[start:end]
+    if "\\" in value:
+        return None
+    return value
+
+
+def extract_start_sids(message: str) -> Optional[Tuple[str, str]]:
+    """
+    Pick streamSid and callSid out of a Twilio media stream "start" message.
+
+    Looks the two values up in the raw text instead of deserializing the whole
+    event (custom parameters, tracks, media format, ...).
+
+    Args:
+        message: The raw "start" message text
+
+    Returns:
+        Tuple of (stream_sid, call_sid), or None if the message is not in
+        Twilio's compact layout and needs a full parse
+    """
+    if '"event":"start"' not in message:
+        return None
+    stream_sid = _find_json_string(message, "streamSid")
+    call_sid = _find_json_string(message, "callSid")
+    if not stream_sid or not call_sid:
+        return None
+    return stream_sid, call_sid
+
+
+@lru_cache(maxsize=1024)
+def build_twiml_url_template(
+    backend_endpoint: str, static_args: Tuple[Tuple[str, Any], ...]
+) -> str:
+    """
+    Build the TwiML webhook URL with a {workflow_run_id} placeholder.
+
+    Args:
+        backend_endpoint: The tunnel domain (without protocol)
+        static_args: Query parameters that are the same for every call
+
+    Returns:
+        URL template to be completed with str.format(workflow_run_id=...)
+    """
+    url = f"https://{backend_endpoint}/api/v1/twilio/twiml?"
+    if static_args:
+        # urlencode escapes braces, so the values cannot clash with the placeholder
+        url = f"{url}{urlencode(static_args)}&"
+    return f"{url}workflow_run_id={{workflow_run_id}}"
+
+
+# How long a cached TwilioService (and the credentials it has loaded) is reused
+# before the organization configuration is read again. Bounds how long a worker
+# keeps using rotated credentials when it did not see the invalidation itself.
+TWILIO_SERVICE_CACHE_TTL_SECONDS = 300
+
+# organization_id -> (created_at monotonic timestamp, TwilioService)
+_twilio_service_cache: Dict[int, Tuple[float, TwilioService]] = {}
+
+
+def get_twilio_service(organization_id: int) -> TwilioService:
+    """
+    Get a TwilioService for the organization, reusing a cached instance.
+
+    The service loads its credentials lazily and keeps them, so reusing the
+    instance avoids a configuration lookup on every webhook and call.
+
+    Args:
+        organization_id: The organization whose Twilio configuration to use
+
+    Returns:
+        TwilioService for the organization
+    """
+    now = time.monotonic()
+    cached = _twilio_service_cache.get(organization_id)
+    if cached and now - cached[0] < TWILIO_SERVICE_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    service = TwilioService(organization_id)
+    _twilio_service_cache[organization_id] = (now, service)
+    return service
+
+
+def invalidate_twilio_service(organization_id: int) -> None:
+    """Drop the cached TwilioService so the next call reloads the configuration."""
+    _twilio_service_cache.pop(organization_id, None)
@@ -0,0 +1,186 @@
+"""Outbound backpressure for telephony media WebSockets.
+
+Sends are buffered and written by a background task, so a lagging peer does
+not stall the pipeline and the buffer cannot grow without bound: once more
+than ``enter_bytes`` are waiting, the queued droppable (audio) messages are
+discarded, and so is any new audio until the buffer drains below
+``exit_bytes``.
+"""
+
+import asyncio
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple, Union
+
+from fastapi import WebSocket
+from loguru import logger
+
+# (kind, payload, size in bytes, droppable)
+_QueuedMessage = Tuple[str, Union[str, bytes], int, bool]
+
+
+def is_twilio_media_message(message: Union[str, bytes]) -> bool:
+    """Whether an outgoing Twilio media stream message carries audio."""
+    if isinstance(message, bytes):
+        return False
+    return message.startswith(('{"event": "media"', '{"event":"media"'))
+
+
+class BackpressureWebSocket:
+    """WebSocket wrapper that buffers outgoing messages and sheds stale audio.
+
+    Everything except ``send_text``, ``send_bytes`` and ``close`` is delegated
+    to the wrapped WebSocket, so the wrapper can be handed to a transport in
+    place of the original.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        enter_bytes: int,
+        exit_bytes: int,
+        is_droppable: Callable[[Union[str, bytes]], bool] = is_twilio_media_message,
+        flush_timeout: float = 2.0,
+    ):
+        self._websocket = websocket
+        self._enter_bytes = enter_bytes
+        self._exit_bytes = exit_bytes
+        self._is_droppable = is_droppable
+        self._flush_timeout = flush_timeout
+
+        self._queue: Deque[_QueuedMessage] = deque()
+        # Bytes queued plus the message currently being written
+        self._buffered_bytes = 0
+        self._dropping = False
+        self._warned = False
+        self._dropped_messages = 0
+
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._writer_error: Optional[Exception] = None
+
+    def __getattr__(self, name):
+        return getattr(self._websocket, name)
+
+    @property
+    def buffered_bytes(self) -> int:
+        return self._buffered_bytes
+
+    @property
+    def dropped_messages(self) -> int:
+        return self._dropped_messages
+
+    async def send_text(self, data: str) -> None:
+        self._enqueue("text", data, len(data))
+
+    async def send_bytes(self, data: bytes) -> None:
+        self._enqueue("bytes", data, len(data))
+
+    async def close(self, code: int = 1000, reason: Optional[str] = None) -> None:
+        """Flush what is buffered (bounded by flush_timeout), then close."""
+        await self.stop()
+        await self._websocket.close(code, reason)
+
+    async def stop(self) -> None:
+        """Flush what is buffered (bounded by flush_timeout) and stop the writer."""
+        if self._writer_task is None:
+            return
+
+        if not self._writer_task.done():
+            try:
+                await asyncio.wait_for(self._drained.wait(), self._flush_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Dropping {len(self._queue)} unsent WebSocket messages on close"
+                )
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+
+        self._writer_task = None
+        self._queue.clear()
+        self._buffered_bytes = 0
+        self._drained.set()
+
+    def _enqueue(self, kind: str, data: Union[str, bytes], size: int) -> None:
+        if self._writer_error is not None:
+            raise self._writer_error
+
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._write_loop())
+
+        droppable = self._is_droppable(data)
+        if self._dropping and droppable:
+            # Stale by the time the peer could play it, so never queue it
+            self._dropped_messages += 1
+            return
+
+        self._queue.append((kind, data, size, droppable))
+        self._buffered_bytes += size
+        self._drained.clear()
+
+        if not self._dropping and self._buffered_bytes > self._enter_bytes:
+            self._dropping = True
+            if not self._warned:
+                self._warned = True
+                logger.warning(
+                    f"WebSocket peer is lagging, {self._buffered_bytes} bytes "
+                    "buffered. Dropping audio until it catches up"
+                )
+            self._drop_queued_audio()
+
+        self._wakeup.set()
+
+    def _drop_queued_audio(self) -> None:
+        """Drop every queued droppable message, keeping the rest in order."""
+        queue = self._queue
+        for _ in range(len(queue)):
+            message = queue.popleft()
+            if message[3]:
+                self._buffered_bytes -= message[2]
+                self._dropped_messages += 1
+            else:
+                queue.append(message)
+
+    def _resume_if_drained(self) -> None:
+        # Only called by the writer, once the peer has actually taken data.
+        # Dropping the queue empties the buffer too, but the peer may still
+        # be stuck on the message in flight.
+        if self._dropping and self._buffered_bytes < self._exit_bytes:
+            self._dropping = False
+            logger.info(
+                f"WebSocket peer caught up after dropping "
+                f"{self._dropped_messages} audio messages"
+            )
+
+    async def _write_loop(self) -> None:
+        # Bound once, this loop runs for every outgoing audio frame
+        send_text = self._websocket.send_text
+        send_bytes = self._websocket.send_bytes
+        try:
+            while True:
+                while not self._queue:
+                    self._resume_if_drained()
+                    self._drained.set()
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+
+                kind, data, size, _ = self._queue.popleft()
+                try:
+                    if kind == "text":
+                        await send_text(data)
+                    else:
+                        await send_bytes(data)
+                finally:
+                    self._buffered_bytes -= size
+
+                self._resume_if_drained()
+        except Exception as e:
+            # Surface the failure to the next sender, e.g. a disconnected peer
+            self._writer_error = e
+            self._queue.clear()
+            self._buffered_bytes = 0
+            self._drained.set()
@@ -3,7 +3,7 @@ from loguru import logger
 from api.db import db_client
 from api.enums import WorkflowRunMode
 from api.services.pricing.cost_calculator import cost_calculator
-from api.services.telephony.twilio import TwilioService
+from api.services.telephony.twilio import get_twilio_service
 from pipecat.utils.context import set_current_run_id
 
 
@@ -40,7 +40,7 @@ async def calculate_workflow_run_cost(ctx, workflow_run_id: int):
                         logger.warning("Workflow not found for workflow run")
                         raise Exception("Workflow not found")
 
-                    twilio_service = TwilioService(workflow.organization_id)
+                    twilio_service = get_twilio_service(workflow.organization_id)
                     call_info = await twilio_service.get_call(twilio_call_sid)
                     # Twilio returns price as a string with negative value (e.g., "-0.0085")
                     if call_info.get("price"):
@@ -0,0 +1,68 @@
+"""Tests for TunnelURLProvider caching."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from api.utils.tunnel import TunnelURLProvider
+
+
+@pytest.fixture(autouse=True)
+def reset_tunnel_cache():
+    TunnelURLProvider.invalidate()
+    TunnelURLProvider._pending = None
+    with patch("api.utils.tunnel.BACKEND_API_ENDPOINT", None):
+        yield
+    TunnelURLProvider.invalidate()
+    TunnelURLProvider._pending = None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_resolution():
+    async def slow_resolve():
+        await asyncio.sleep(0.01)
+        return "example.trycloudflare.com"
+
+    resolve = AsyncMock(side_effect=slow_resolve)
+    with patch.object(TunnelURLProvider, "_resolve_tunnel_url", resolve):
+        urls = await asyncio.gather(
+            *(TunnelURLProvider.get_tunnel_url() for _ in range(5))
+        )
+        assert await TunnelURLProvider.get_tunnel_url() == urls[0]
+
+    assert set(urls) == {"example.trycloudflare.com"}
+    assert resolve.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_resolution_is_not_cached():
+    resolve = AsyncMock(side_effect=[ValueError("no tunnel"), "example.com"])
+    with patch.object(TunnelURLProvider, "_resolve_tunnel_url", resolve):
+        with pytest.raises(ValueError):
+            await TunnelURLProvider.get_tunnel_url()
+
+        assert await TunnelURLProvider.get_tunnel_url() == "example.com"
+
+    assert resolve.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_forces_new_resolution():
+    resolve = AsyncMock(side_effect=["old.example.com", "new.example.com"])
+    with patch.object(TunnelURLProvider, "_resolve_tunnel_url", resolve):
+        assert await TunnelURLProvider.get_tunnel_url() == "old.example.com"
+        TunnelURLProvider.invalidate()
+        assert await TunnelURLProvider.get_tunnel_url() == "new.example.com"
+
+
+@pytest.mark.asyncio
+async def test_configured_endpoint_skips_resolution():
+    resolve = AsyncMock()
+    with (
+        patch("api.utils.tunnel.BACKEND_API_ENDPOINT", "api.example.com"),
+        patch.object(TunnelURLProvider, "_resolve_tunnel_url", resolve),
+    ):
+        assert await TunnelURLProvider.get_tunnel_url() == "api.example.com"
+
+    resolve.assert_not_awaited()
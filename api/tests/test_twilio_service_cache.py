@@ -0,0 +1,35 @@
+"""Tests for per-organization TwilioService caching."""
+
+from unittest.mock import patch
+
+from api.services.telephony import twilio
+
+
+def test_get_twilio_service_reuses_instance_per_organization():
+    twilio._twilio_service_cache.clear()
+
+    first = twilio.get_twilio_service(1)
+    assert twilio.get_twilio_service(1) is first
+    assert twilio.get_twilio_service(2) is not first
+
+
+def test_get_twilio_service_expires_after_ttl():
+    twilio._twilio_service_cache.clear()
+
+    with patch.object(twilio.time, "monotonic", return_value=1000.0):
+        first = twilio.get_twilio_service(1)
+
+    expired_at = 1000.0 + twilio.TWILIO_SERVICE_CACHE_TTL_SECONDS
+    with patch.object(twilio.time, "monotonic", return_value=expired_at):
+        assert twilio.get_twilio_service(1) is not first
+
+
+def test_invalidate_twilio_service_drops_cached_instance():
+    twilio._twilio_service_cache.clear()
+
+    first = twilio.get_twilio_service(1)
+    twilio.invalidate_twilio_service(1)
+    assert twilio.get_twilio_service(1) is not first
+
+    # Invalidating an organization that was never cached is a no-op
+    twilio.invalidate_twilio_service(999)
@@ -0,0 +1,49 @@
+"""Tests for Twilio webhook signature verification."""
+
+import base64
+import hashlib
+import hmac
+
+import pytest
+
+from api.services.telephony import twilio
+
+URL = "https://api.example.com/api/v1/twilio/status-callback/5"
+PARAMS = {"CallSid": "CA1", "CallStatus": "completed", "From": "+15551234567"}
+
+
+def _sign(url: str) -> str:
+    # Reference construction from Twilio's documentation
+    payload = url + "".join(f"{name}{PARAMS[name]}" for name in sorted(PARAMS))
+    digest = hmac.new(b"secret", payload.encode(), hashlib.sha1).digest()
+    return base64.b64encode(digest).decode()
+
+
+def _service() -> twilio.TwilioService:
+    service = twilio.TwilioService(1)
+    service.account_sid = "AC1"
+    service.auth_token = "secret"
+    return service
+
+
+def test_compute_signature_matches_reference():
+    assert twilio.compute_signature(b"secret", URL, PARAMS).decode() == _sign(URL)
+
+
+@pytest.mark.asyncio
+async def test_verify_signature_accepts_url_with_or_without_default_port():
+    service = _service()
+
+    assert await service.verify_signature(URL, PARAMS, _sign(URL))
+    assert await service.verify_signature(
+        URL, PARAMS, _sign(URL.replace("api.example.com", "api.example.com:443"))
+    )
+
+
+@pytest.mark.asyncio
+async def test_verify_signature_rejects_tampered_params():
+    service = _service()
+
+    assert not await service.verify_signature(
+        URL, {**PARAMS, "CallStatus": "busy"}, _sign(URL)
+    )
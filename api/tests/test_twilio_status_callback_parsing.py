@@ -0,0 +1,90 @@
+"""Tests for parsing Twilio status callbacks and media stream messages."""
+
+import pytest
+
+from api.services.telephony.twilio import (
+    extract_start_sids,
+    parse_status_callback_fields,
+)
+
+
+def test_parse_status_callback_fields_keeps_known_fields_only():
+    body = (
+        b"AccountSid=AC123&CallSid=CA456&CallStatus=completed"
+        b"&From=%2B15551234567&To=%2B15557654321&Direction=outbound-api"
+        b"&CallDuration=42&CallerCity=SAN+FRANCISCO&ApiVersion=2010-04-01"
+    )
+
+    assert parse_status_callback_fields(body) == {
+        "CallSid": "CA456",
+        "CallStatus": "completed",
+        "From": "+15551234567",
+        "To": "+15557654321",
+        "Direction": "outbound-api",
+        "CallDuration": "42",
+    }
+
+
+def test_parse_status_callback_fields_does_not_match_key_suffixes():
+    body = b"ForwardedFrom=%2B1555&CalledTo=%2B1666&CallSid=CA1&CallStatus=ringing"
+
+    assert parse_status_callback_fields(body) == {
+        "CallSid": "CA1",
+        "CallStatus": "ringing",
+    }
+
+
+def test_parse_status_callback_fields_empty_body():
+    assert parse_status_callback_fields(b"") == {}
+
+
+def test_status_callback_request_from_twilio_keeps_allowed_extras_only():
+    from api.routes.twilio import StatusCallbackRequest
+
+    status = StatusCallbackRequest.from_twilio(
+        parse_status_callback_fields(
+            b"CallSid=CA1&CallStatus=failed&To=%2B1555&Duration=3"
+            b"&SipResponseCode=486&AccountSid=AC1&CallerCountry=US"
+        )
+    )
+
+    assert status.call_id == "CA1"
+    assert status.status == "failed"
+    assert status.duration == "3"
+    assert status.extra == {"SipResponseCode": "486"}
+    assert status.to_log_data() == {
+        "call_id": "CA1",
+        "to_number": "+1555",
+        "duration": "3",
+        "extras": {"SipResponseCode": "486"},
+    }
+
+
+def test_extract_start_sids_from_compact_start_message():
+    message = (
+        '{"event":"start","sequenceNumber":"1","start":{"accountSid":"AC1",'
+        '"streamSid":"MZ123","callSid":"CA456","tracks":["inbound"],'
+        '"customParameters":{},"mediaFormat":{"encoding":"audio/x-mulaw",'
+        '"sampleRate":8000,"channels":1}},"streamSid":"MZ123"}'
+    )
+
+    assert extract_start_sids(message) == ("MZ123", "CA456")
+
+
+def test_extract_start_sids_needs_full_parse_for_other_layouts():
+    # Pretty-printed JSON, other events and missing values use the fallback
+    assert extract_start_sids('{"event": "start", "start": {}}') is None
+    assert extract_start_sids('{"event":"media","streamSid":"MZ1"}') is None
+    assert extract_start_sids('{"event":"start","start":{"streamSid":"MZ1"}}') is None
+
+
+def test_status_callback_request_from_provider_dispatches_by_provider():
+    from api.routes.twilio import StatusCallbackRequest
+
+    status = StatusCallbackRequest.from_provider(
+        "twilio", {"CallSid": "CA1", "CallStatus": "busy"}
+    )
+    assert (status.call_id, status.status) == ("CA1", "busy")
+
+    with pytest.raises(ValueError):
+        StatusCallbackRequest.from_provider("unknown", {})
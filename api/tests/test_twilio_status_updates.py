@@ -0,0 +1,241 @@
+"""Tests for processing Twilio status callbacks on workflow runs."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from api.routes.twilio import (
+    StatusCallbackRequest,
+    _process_status_update,
+    _utc_now_iso,
+    status_callback,
+)
+
+
+def _workflow_run(campaign_id=None):
+    return SimpleNamespace(
+        id=7,
+        campaign_id=campaign_id,
+        queued_run_id=3,
+        logs={},
+        gathered_context={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_terminal_failure_is_written_in_a_single_update():
+    publisher = AsyncMock()
+    with (
+        patch("api.routes.twilio.db_client") as mock_db_client,
+        patch("api.routes.twilio.campaign_call_dispatcher") as mock_dispatcher,
+        patch(
+            "api.routes.twilio.get_campaign_event_publisher",
+            AsyncMock(return_value=publisher),
+        ),
+    ):
+        mock_db_client.append_workflow_run_log = AsyncMock()
+        mock_dispatcher.release_call_slot = AsyncMock()
+
+        await _process_status_update(
+            _workflow_run(campaign_id=11),
+            StatusCallbackRequest(call_id="CA1", status="no-answer"),
+        )
+
+    mock_db_client.append_workflow_run_log.assert_awaited_once()
+    run_id, key, entry = mock_db_client.append_workflow_run_log.await_args.args
+    kwargs = mock_db_client.append_workflow_run_log.await_args.kwargs
+    assert (run_id, key) == (7, "twilio_status_callbacks")
+    assert entry["status"] == "no-answer"
+    assert kwargs["is_completed"] is True
+    assert kwargs["gathered_context"] == {
+        "call_tags": ["not_connected", "twilio_no-answer"]
+    }
+    mock_dispatcher.release_call_slot.assert_awaited_once_with(7)
+    publisher.publish_retry_needed.assert_awaited_once_with(
+        workflow_run_id=7, reason="no_answer", campaign_id=11, queued_run_id=3
+    )
+
+
+@pytest.mark.asyncio
+async def test_non_campaign_status_only_appends_log():
+    with (
+        patch("api.routes.twilio.db_client") as mock_db_client,
+        patch("api.routes.twilio.campaign_call_dispatcher") as mock_dispatcher,
+    ):
+        mock_db_client.append_workflow_run_log = AsyncMock()
+        mock_dispatcher.release_call_slot = AsyncMock()
+
+        await _process_status_update(
+            _workflow_run(), StatusCallbackRequest(call_id="CA1", status="completed")
+        )
+
+    mock_db_client.append_workflow_run_log.assert_awaited_once()
+    assert mock_db_client.append_workflow_run_log.await_args.kwargs == {}
+    mock_dispatcher.release_call_slot.assert_not_awaited()
+
+
+class _FormRequest:
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def body(self) -> bytes:
+        return self._body
+
+
+@pytest.mark.asyncio
+async def test_progress_status_skips_database():
+    with patch("api.routes.twilio.db_client") as mock_db_client:
+        mock_db_client.get_workflow_run_with_org = AsyncMock()
+
+        result = await status_callback(
+            _FormRequest(b"CallSid=CA1&CallStatus=ringing"),
+            workflow_run_id=7,
+            x_twilio_signature="signature",
+        )
+
+    assert result["status"] == "success"
+    mock_db_client.get_workflow_run_with_org.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_unsigned_callback_is_rejected_before_database():
+    with (
+        patch("api.routes.twilio.TELEPHONY_REQUIRE_SIGNATURE", True),
+        patch("api.routes.twilio.db_client") as mock_db_client,
+    ):
+        mock_db_client.get_workflow_run_with_org = AsyncMock()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await status_callback(
+                _FormRequest(b"CallSid=CA1&CallStatus=completed"), workflow_run_id=7
+            )
+
+    assert exc_info.value.status_code == 401
+    mock_db_client.get_workflow_run_with_org.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_invalid_signature_is_rejected():
+    service = AsyncMock()
+    service.verify_signature.return_value = False
+    with (
+        patch("api.routes.twilio.db_client") as mock_db_client,
+        patch("api.routes.twilio.get_twilio_service", return_value=service),
+        patch("api.routes.twilio.invalidate_twilio_service") as mock_invalidate,
+        patch(
+            "api.routes.twilio.TunnelURLProvider.get_tunnel_url",
+            AsyncMock(return_value="example.com"),
+        ),
+        patch("api.routes.twilio._process_status_update") as mock_process,
+    ):
+        mock_db_client.get_workflow_run_with_org = AsyncMock(
+            return_value=(_workflow_run(), 5)
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await status_callback(
+                _FormRequest(b"CallSid=CA1&CallStatus=completed"),
+                workflow_run_id=7,
+                x_twilio_signature="forged",
+            )
+
+    assert exc_info.value.status_code == 403
+    # Checked again with freshly loaded credentials before rejecting
+    mock_invalidate.assert_called_once_with(5)
+    assert service.verify_signature.await_count == 2
+    mock_process.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_signature_is_rechecked_after_auth_token_rotation():
+    stale_service = AsyncMock()
+    stale_service.verify_signature.return_value = False
+    fresh_service = AsyncMock()
+    fresh_service.verify_signature.return_value = True
+    with (
+        patch("api.routes.twilio.db_client") as mock_db_client,
+        patch(
+            "api.routes.twilio.get_twilio_service",
+            side_effect=[stale_service, fresh_service],
+        ),
+        patch("api.routes.twilio.invalidate_twilio_service") as mock_invalidate,
+        patch(
+            "api.routes.twilio.TunnelURLProvider.get_tunnel_url",
+            AsyncMock(return_value="example.com"),
+        ),
+        patch("api.routes.twilio._process_status_update", AsyncMock()) as mock_process,
+    ):
+        workflow_run = _workflow_run()
+        mock_db_client.get_workflow_run_with_org = AsyncMock(
+            return_value=(workflow_run, 5)
+        )
+
+        result = await status_callback(
+            _FormRequest(b"CallSid=CA1&CallStatus=completed"),
+            workflow_run_id=7,
+            x_twilio_signature="signature",
+        )
+
+    assert result["status"] == "success"
+    mock_invalidate.assert_called_once_with(5)
+    fresh_service.verify_signature.assert_awaited_once()
+    mock_process.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_callback_without_organization_is_rejected():
+    with (
+        patch("api.routes.twilio.TELEPHONY_REQUIRE_SIGNATURE", True),
+        patch("api.routes.twilio.db_client") as mock_db_client,
+        patch("api.routes.twilio._process_status_update") as mock_process,
+    ):
+        mock_db_client.get_workflow_run_with_org = AsyncMock(
+            return_value=(_workflow_run(), None)
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await status_callback(
+                _FormRequest(b"CallSid=CA1&CallStatus=completed"),
+                workflow_run_id=7,
+                x_twilio_signature="signature",
+            )
+
+    assert exc_info.value.status_code == 403
+    mock_process.assert_not_called()
+
+
+def test_utc_now_iso_matches_datetime_isoformat():
+    before = datetime.now(UTC)
+    timestamp = datetime.fromisoformat(_utc_now_iso())
+    after = datetime.now(UTC)
+
+    assert timestamp.tzinfo == UTC
+    assert before.replace(microsecond=0) <= timestamp <= after
+
+
+@pytest.mark.asyncio
+async def test_callback_with_too_many_fields_is_rejected():
+    service = AsyncMock()
+    body = b"CallSid=CA1&CallStatus=completed" + b"&x=1" * 100
+    with (
+        patch("api.routes.twilio.db_client") as mock_db_client,
+        patch("api.routes.twilio.get_twilio_service", return_value=service),
+        patch(
+            "api.routes.twilio.TunnelURLProvider.get_tunnel_url",
+            AsyncMock(return_value="example.com"),
+        ),
+    ):
+        mock_db_client.get_workflow_run_with_org = AsyncMock(
+            return_value=(_workflow_run(), 5)
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await status_callback(
+                _FormRequest(body), workflow_run_id=7, x_twilio_signature="signature"
+            )
+
+    assert exc_info.value.status_code == 400
+    service.verify_signature.assert_not_awaited()
@@ -0,0 +1,48 @@
+"""Tests for the TwiML served to Twilio and the URLs pointing at it."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from api.services.telephony import twilio
+
+
+def test_build_twiml_url_template_fills_in_workflow_run_id():
+    template = twilio.build_twiml_url_template(
+        "example.com", (("workflow_id", 1), ("user_id", 2), ("organization_id", 3))
+    )
+
+    assert template.format(workflow_run_id=9) == (
+        "https://example.com/api/v1/twilio/twiml"
+        "?workflow_id=1&user_id=2&organization_id=3&workflow_run_id=9"
+    )
+    assert (
+        twilio.build_twiml_url_template(
+            "example.com", (("workflow_id", 1), ("user_id", 2), ("organization_id", 3))
+        )
+        is template
+    )
+
+
+@pytest.mark.asyncio
+async def test_start_call_twiml_bytes_match_str_fallback():
+    service = twilio.TwilioService(1)
+
+    with patch.object(
+        twilio.TunnelURLProvider,
+        "get_tunnel_url",
+        AsyncMock(return_value="example.com"),
+    ):
+        twiml_bytes = await service.get_start_call_twiml_bytes(1, 2, 9)
+        twiml_str = await service.get_start_call_twiml(1, 2, 9)
+
+    assert twiml_bytes == (
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        b"<Response>\n"
+        b"    <Connect>\n"
+        b'        <Stream url="wss://example.com/api/v1/twilio/ws/1/2/9"></Stream>\n'
+        b"    </Connect>\n"
+        b'    <Pause length="40"/>\n'
+        b"</Response>"
+    )
+    assert twiml_str == twiml_bytes.decode()
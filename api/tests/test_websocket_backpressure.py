@@ -0,0 +1,159 @@
+"""Tests for the backpressure-aware media WebSocket wrapper."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from api.services.telephony.websocket_backpressure import (
+    BackpressureWebSocket,
+    is_twilio_media_message,
+)
+
+MEDIA = '{"event": "media", "media": {"payload": "xxxx"}}'
+MARK = '{"event": "mark", "mark": {"name": "m1"}}'
+
+
+class _SlowWebSocket:
+    """Fake WebSocket whose sends block until released."""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = None
+        self.release = asyncio.Event()
+        self.client_state = "CONNECTED"
+
+    async def send_text(self, data):
+        await self.release.wait()
+        self.sent.append(data)
+
+    async def send_bytes(self, data):
+        await self.release.wait()
+        self.sent.append(data)
+
+    async def close(self, code=1000, reason=None):
+        self.closed = (code, reason)
+
+
+def test_is_twilio_media_message():
+    assert is_twilio_media_message(MEDIA)
+    assert is_twilio_media_message('{"event":"media","media":{}}')
+    assert not is_twilio_media_message(MARK)
+    assert not is_twilio_media_message(b"raw")
+
+
+@pytest.mark.asyncio
+async def test_messages_are_written_in_order():
+    websocket = _SlowWebSocket()
+    websocket.release.set()
+    wrapper = BackpressureWebSocket(websocket, enter_bytes=1024, exit_bytes=10)
+
+    await wrapper.send_text(MEDIA)
+    await wrapper.send_text(MARK)
+    await wrapper.close()
+
+    assert websocket.sent == [MEDIA, MARK]
+    assert websocket.closed == (1000, None)
+    assert wrapper.client_state == "CONNECTED"
+
+
+@pytest.mark.asyncio
+async def test_queued_audio_is_dropped_when_peer_lags():
+    websocket = _SlowWebSocket()
+    enter_bytes = len(MEDIA) * 3
+    wrapper = BackpressureWebSocket(
+        websocket, enter_bytes=enter_bytes, exit_bytes=len(MEDIA) * 2
+    )
+
+    await wrapper.send_text(MARK)
+    for _ in range(10):
+        await wrapper.send_text(MEDIA)
+    await asyncio.sleep(0)
+
+    assert wrapper.buffered_bytes <= enter_bytes
+    assert wrapper.dropped_messages > 0
+
+    websocket.release.set()
+    await wrapper.stop()
+
+    # Non-audio messages are never dropped
+    assert websocket.sent[0] == MARK
+    assert len(websocket.sent) == 11 - wrapper.dropped_messages
+
+
+@pytest.mark.asyncio
+async def test_stalled_peer_stays_in_drop_mode():
+    websocket = _SlowWebSocket()
+    # Shaped like the defaults: exit_bytes is tiny next to enter_bytes but
+    # still larger than the frame stuck in flight
+    wrapper = BackpressureWebSocket(
+        websocket, enter_bytes=len(MEDIA) * 100, exit_bytes=len(MEDIA) * 4
+    )
+
+    with patch("api.services.telephony.websocket_backpressure.logger") as mock_logger:
+        # The first frame is stuck in flight with the stalled peer
+        await wrapper.send_text(MEDIA)
+        await asyncio.sleep(0)
+
+        for _ in range(5999):
+            await wrapper.send_text(MEDIA)
+            await asyncio.sleep(0)
+
+    # Everything after the in-flight frame was dropped, the buffer never
+    # refilled towards enter_bytes
+    assert wrapper.buffered_bytes == len(MEDIA)
+    assert wrapper.dropped_messages == 5999
+    mock_logger.info.assert_not_called()
+
+    websocket.release.set()
+    await wrapper.stop()
+    assert websocket.sent == [MEDIA]
+
+
+@pytest.mark.asyncio
+async def test_audio_resumes_once_peer_drains_below_exit_bytes():
+    websocket = _SlowWebSocket()
+    wrapper = BackpressureWebSocket(
+        websocket, enter_bytes=len(MEDIA) * 100, exit_bytes=len(MEDIA) * 4
+    )
+
+    with patch("api.services.telephony.websocket_backpressure.logger") as mock_logger:
+        await wrapper.send_text(MEDIA)
+        await asyncio.sleep(0)
+        for _ in range(200):
+            await wrapper.send_text(MEDIA)
+
+        # Non-audio messages are still queued while dropping
+        await wrapper.send_text(MARK)
+        dropped = wrapper.dropped_messages
+
+        # Below exit_bytes already, but nothing was delivered yet
+        assert wrapper.buffered_bytes < len(MEDIA) * 4
+        await wrapper.send_text(MEDIA)
+        assert wrapper.dropped_messages == dropped + 1
+
+        websocket.release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        mock_logger.info.assert_called_once()
+
+        await wrapper.send_text(MEDIA)
+        await wrapper.stop()
+
+    assert websocket.sent == [MEDIA, MARK, MEDIA]
+    assert wrapper.dropped_messages == dropped + 1
+
+
+@pytest.mark.asyncio
+async def test_send_error_is_raised_to_next_sender():
+    class _BrokenWebSocket(_SlowWebSocket):
+        async def send_text(self, data):
+            raise RuntimeError("disconnected")
+
+    wrapper = BackpressureWebSocket(_BrokenWebSocket(), enter_bytes=1024, exit_bytes=10)
+    await wrapper.send_text(MEDIA)
+    await asyncio.sleep(0)
+
+    with pytest.raises(RuntimeError):
+        await wrapper.send_text(MEDIA)
+    await wrapper.stop()
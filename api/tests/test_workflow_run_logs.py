@@ -0,0 +1,94 @@
+"""Database tests for the workflow run log append and organization lookup."""
+
+import uuid
+
+import pytest
+
+from api.enums import WorkflowRunMode
+
+
+async def _create_workflow_run(db_session, organization_id=None):
+    user = await db_session.get_or_create_user_by_provider_id(
+        f"provider_user_{uuid.uuid4().hex}"
+    )
+    workflow = await db_session.create_workflow(
+        "Test Workflow",
+        {"nodes": [], "edges": []},
+        user.id,
+        organization_id=organization_id,
+    )
+    return await db_session.create_workflow_run(
+        "Test Run", workflow.id, WorkflowRunMode.TWILIO.value, user.id
+    )
+
+
+@pytest.mark.asyncio
+async def test_append_workflow_run_log_keeps_every_entry(db_session):
+    workflow_run = await _create_workflow_run(db_session)
+    await db_session.update_workflow_run(
+        workflow_run.id, logs={"other": {"kept": True}}
+    )
+
+    await db_session.append_workflow_run_log(
+        workflow_run.id, "twilio_status_callbacks", {"status": "ringing"}
+    )
+    await db_session.append_workflow_run_log(
+        workflow_run.id, "twilio_status_callbacks", {"status": "completed"}
+    )
+
+    workflow_run = await db_session.get_workflow_run_by_id(workflow_run.id)
+    assert workflow_run.logs == {
+        "other": {"kept": True},
+        "twilio_status_callbacks": [{"status": "ringing"}, {"status": "completed"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_append_workflow_run_log_merges_gathered_context(db_session):
+    workflow_run = await _create_workflow_run(db_session)
+    await db_session.update_workflow_run(
+        workflow_run.id, gathered_context={"customer": "Ada"}
+    )
+
+    await db_session.append_workflow_run_log(
+        workflow_run.id,
+        "twilio_status_callbacks",
+        {"status": "busy"},
+        is_completed=True,
+        gathered_context={"call_tags": ["not_connected", "twilio_busy"]},
+    )
+
+    workflow_run = await db_session.get_workflow_run_by_id(workflow_run.id)
+    assert workflow_run.is_completed is True
+    assert workflow_run.gathered_context == {
+        "customer": "Ada",
+        "call_tags": ["not_connected", "twilio_busy"],
+    }
+    assert workflow_run.logs["twilio_status_callbacks"] == [{"status": "busy"}]
+
+
+@pytest.mark.asyncio
+async def test_append_workflow_run_log_raises_for_missing_run(db_session):
+    with pytest.raises(ValueError):
+        await db_session.append_workflow_run_log(
+            -1, "twilio_status_callbacks", {"status": "completed"}
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_workflow_run_with_org(db_session):
+    user = await db_session.get_or_create_user_by_provider_id(
+        f"provider_user_{uuid.uuid4().hex}"
+    )
+    organization, _ = await db_session.get_or_create_organization_by_provider_id(
+        f"provider_org_{uuid.uuid4().hex}", user.id
+    )
+    workflow_run = await _create_workflow_run(db_session, organization.id)
+
+    found_run, organization_id = await db_session.get_workflow_run_with_org(
+        workflow_run.id
+    )
+    assert found_run.id == workflow_run.id
+    assert organization_id == organization.id
+
+    assert await db_session.get_workflow_run_with_org(-1) == (None, None)
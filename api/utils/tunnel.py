@@ -1,26 +1,34 @@
 """Utility for getting the cloudflared tunnel URL at runtime."""
 
 import asyncio
-import os
 import re
+import time
 from typing import Optional
 
 import aiohttp
 from loguru import logger
 
+from api.constants import BACKEND_API_ENDPOINT
+
 
 class TunnelURLProvider:
     """Provider for getting the tunnel URL from cloudflared or environment."""
 
+    # How long a resolved tunnel URL is reused before resolving it again
+    CACHE_TTL_SECONDS = 300
+
+    _cached_url: Optional[str] = None
+    _cached_at: float = 0.0
+    # In-flight resolution shared by concurrent callers
+    _pending: Optional[asyncio.Future] = None
+
     @classmethod
     async def get_tunnel_url(cls) -> str:
         """
-        Get the tunnel URL for external access.
+        Get the tunnel URL for external access, resolving it at most once per TTL.
 
-        Priority:
-        1. BACKEND_API_ENDPOINT environment variable (if set)
-        2. Query cloudflared metrics endpoint
-        3. Raise error if neither available
+        Concurrent callers share a single in-flight resolution. Failed
+        resolutions are not cached.
 
         Returns:
             str: The tunnel domain (without protocol)
@@ -28,13 +36,49 @@ class TunnelURLProvider:
         Raises:
             ValueError: If no tunnel URL can be determined
         """
-        # First priority: Check environment variable
-        env_endpoint = os.getenv("BACKEND_API_ENDPOINT")
-        if env_endpoint:
-            logger.debug(f"Using BACKEND_API_ENDPOINT from environment: {env_endpoint}")
-            return env_endpoint
+        # A configured endpoint is read once at import, nothing to resolve
+        if BACKEND_API_ENDPOINT:
+            return BACKEND_API_ENDPOINT
+
+        if (
+            cls._cached_url
+            and time.monotonic() - cls._cached_at < cls.CACHE_TTL_SECONDS
+        ):
+            return cls._cached_url
+
+        if cls._pending is None:
+            cls._pending = asyncio.ensure_future(cls._resolve_tunnel_url())
+        pending = cls._pending
+
+        try:
+            url = await asyncio.shield(pending)
+        finally:
+            if cls._pending is pending and pending.done():
+                cls._pending = None
+
+        cls._cached_url = url
+        cls._cached_at = time.monotonic()
+        return url
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Forget the cached tunnel URL, e.g. after the tunnel was restarted."""
+        cls._cached_url = None
+        cls._cached_at = 0.0
+
+    @classmethod
+    async def _resolve_tunnel_url(cls) -> str:
+        """
+        Resolve the tunnel URL from the cloudflared metrics endpoint.
+
+        Only used when BACKEND_API_ENDPOINT is not set, see get_tunnel_url.
+
+        Returns:
+            str: The tunnel domain (without protocol)
 
-        # Second priority: Query cloudflared
+        Raises:
+            ValueError: If no tunnel URL can be determined
+        """
         try:
             # Try to get URL from cloudflared metrics
             url = await cls._get_cloudflared_url()
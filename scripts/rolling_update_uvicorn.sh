@@ -145,6 +145,9 @@ start_new_uvicorn_workers() {
         log_error "FASTAPI_WORKERS environment variable is not set"
         return 1
     fi
+
+    # Same WebSocket tuning as start_services.sh
+    local ws_options=${UVICORN_WS_OPTIONS:-"--ws-max-size 65536 --ws-max-queue 8 --ws-per-message-deflate false"}
     
     # Activate virtual environment
     source ${VENV_PATH}/bin/activate
@@ -175,7 +178,7 @@ start_new_uvicorn_workers() {
     (
         cd "$BASE_DIR"
         export LOG_FILE_PATH="$log_dir/uvicorn-rollover-${timestamp}-${script_pid}.log"
-        exec uvicorn api.app:app --host 0.0.0.0 --port $new_port --workers $FASTAPI_WORKERS >>"$LOG_FILE_PATH" 2>&1
+        exec uvicorn api.app:app --host 0.0.0.0 --port $new_port --workers $FASTAPI_WORKERS $ws_options >>"$LOG_FILE_PATH" 2>&1
     ) &
 
     local new_pid=$!
@@ -35,6 +35,11 @@ fi
 FASTAPI_PORT=${FASTAPI_PORT:-8000}
 FASTAPI_WORKERS=${FASTAPI_WORKERS:-1}
 
+# WebSocket tuning for Twilio media streams: many small (~250 B) frames of
+# already compressed µ-law audio. Cap message size and queue length to bound
+# per-connection memory, and skip per-message deflate which gains nothing.
+UVICORN_WS_OPTIONS=${UVICORN_WS_OPTIONS:-"--ws-max-size 65536 --ws-max-queue 8 --ws-per-message-deflate false"}
+
 ###############################################################################
 ### 2) Define services
 ###############################################################################
@@ -50,7 +55,7 @@ SERVICE_NAMES=(
 SERVICE_COMMANDS=(
   "python -m api.services.telephony.ari_manager"
   "python -m api.services.campaign.campaign_orchestrator"
-  "uvicorn api.app:app --host 0.0.0.0 --port $FASTAPI_PORT --workers $FASTAPI_WORKERS"
+  "uvicorn api.app:app --host 0.0.0.0 --port $FASTAPI_PORT --workers $FASTAPI_WORKERS $UVICORN_WS_OPTIONS"
 )
 
 # Add ARQ workers dynamically